@@ -2,6 +2,7 @@ import streamlit as st
 st.set_page_config(page_title="NoBrokerage AI", layout="wide")  
 
 from model import PropertySearchModel  # 👈 Make sure your model class is in model.py
+import numpy as np
 import pandas as pd
 
 # Load model once
@@ -16,6 +17,16 @@ def load_model():
 
 model = load_model()
 
+# Cache per-query results so widget interactions / reruns with the same
+# query skip the whole parse+filter+sort pipeline
+@st.cache_data(show_spinner=False)
+def run_search(query: str):
+    return model.search(query)
+
+@st.cache_data(show_spinner=False)
+def summarize(df_results: pd.DataFrame, filters: dict) -> str:
+    return model.generate_summary(df_results, filters)
+
 # UI
 # st.set_page_config(page_title="NoBrokerage AI", layout="wide")
 st.title("🏠 NoBrokerage Property Search AI")
@@ -26,8 +37,8 @@ user_query = st.text_input("🔍 Enter your property search query")
 
 if user_query:
     # Run model
-    df_results, filters = model.search(user_query)
-    summary = model.generate_summary(df_results, filters)
+    df_results, filters = run_search(user_query)
+    summary = summarize(df_results, filters)
 
     # Show summary
     st.subheader("📊 Summary")
@@ -38,49 +49,37 @@ if user_query:
     if df_results.empty:
         st.warning("No properties found.")
     else:
-        df_results = df_results.sort_values(by="projectName", ascending=True).reset_index(drop=True)
-
-        for i, row in df_results.iterrows():
+        order = np.argsort(df_results["projectName"].astype("string").to_numpy(),
+                           kind="stable")
+        df_results = df_results.iloc[order].reset_index(drop=True)
+
+        # Vectorize the NaN/blank cleanup once over the sliced frame,
+        # then render with itertuples — no per-row Series or pd.isna calls
+        bad_values = ["", "nan", "none", "unknown", "not mentioned", "n/a"]
+        # customBHK keeps the original '2BHK' label; 'type' is numeric now
+        view = df_results[["projectName", "fullAddress", "landmark", "customBHK",
+                           "price", "carpetArea", "status", "furnishedType",
+                           "bathrooms", "balcony"]].copy()
+        for col in ("fullAddress", "landmark", "status", "furnishedType"):
+            cleaned = view[col].astype(str).fillna("")
+            view[col] = cleaned.where(
+                ~cleaned.str.strip().str.lower().isin(bad_values),
+                "Not mentioned")
+
+        both_missing = ((view["fullAddress"] == "Not mentioned")
+                        & (view["landmark"] == "Not mentioned"))
+        view["location"] = (view["fullAddress"] + ", " + view["landmark"]).where(
+            ~both_missing, "Location details coming soon")
+
+        for col in ("bathrooms", "balcony"):
+            view[col] = view[col].astype("object").where(view[col].notna(), "N/A")
+
+        for i, row in enumerate(view.itertuples(index=False), 1):
             st.markdown("---")
-            st.markdown(f"### #{i+1} — {row['projectName']}")
-            city = row.get("city") or row.get("fullAddress") or ""
-            locality = row.get("landmark") or row.get("locality") or ""
-
-            # Clean up invalid or missing values
-            if not isinstance(city, str) or city.strip().lower() in ["", "nan", "none", "unknown", "not mentioned"]:
-                city = "Not mentioned"
-            if not isinstance(locality, str) or locality.strip().lower() in ["", "nan", "none", "unknown", "not mentioned"]:
-                locality = "Not mentioned"
-
-            # Combine city and locality safely
-            if city == "Not mentioned" and locality == "Not mentioned":
-                location_display = "Location details coming soon"
-            else:
-                location_display = f"{city}, {locality}"
-
-            st.markdown(f"📍 **{location_display}**")
-
-            st.markdown(f"🏠 **{row['type']}** | 💰 ₹{row['price']/1e5:.2f} Lakh | 📐 {row['carpetArea']} sq.ft")
-           
-            status = row.get("status") or ""
-
-            # # Clean missing values
-            furnishing = row.get("furnishedType")  # <-- same as model CSV
-            if pd.isna(furnishing) or str(furnishing).strip().lower() in ["", "nan", "none", "unknown", "n/a"]:
-                furnishing = "Not mentioned"
-
-
-            st.markdown(f"🔑 Status: `{status}` | 🛋️ `{furnishing}`")
-            # st.markdown(f"✨ {row['bathroom']} Bathrooms, {row['balcony']} Balconies")
-            # bathroom = row.get("bathroom", "N/A")
-            # balcony = row.get("balcony", "N/A")
-            # st.markdown(f"✨ {bathroom} Bathrooms, {balcony} Balconies")
-            bathroom = row.get("bathrooms")
-            balcony = row.get("balcony")
-
-            bathroom = bathroom if pd.notna(bathroom) else "N/A"
-            balcony = balcony if pd.notna(balcony) else "N/A"
-
-            st.markdown(f"✨ {bathroom} Bathrooms, {balcony} Balconies")
-            # st.markdown(f"[🔗 View Project](/project/{row['slug']})")
+            st.markdown(f"### #{i} — {row.projectName}")
+            st.markdown(f"📍 **{row.location}**")
+            st.markdown(f"🏠 **{row.customBHK}** | 💰 ₹{row.price/1e5:.2f} Lakh | 📐 {row.carpetArea:g} sq.ft")
+            st.markdown(f"🔑 Status: `{row.status}` | 🛋️ `{row.furnishedType}`")
+            st.markdown(f"✨ {row.bathrooms} Bathrooms, {row.balcony} Balconies")
+            # st.markdown(f"[🔗 View Project](/project/{row.slug})")
             st.markdown("🔗 Project details coming soon")
@@ -1,8 +1,23 @@
+import hashlib
+import os
+
+import numpy as np
 import pandas as pd
+import pyarrow.parquet
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+# Columns actually consumed by search / summaries / the card renderers —
+# everything else (RERA ids, location fkeys, timestamps, ...) is dead
+# weight through every merge, filter and sort
+PROJECT_COLS = ['id', 'projectName', 'slug', 'status']
+ADDRESS_COLS = ['projectId', 'landmark', 'fullAddress']
+CONFIG_COLS = ['id', 'projectId', 'type', 'customBHK']
+VARIANT_COLS = ['configurationId', 'bathrooms', 'balcony', 'furnishedType',
+                'lift', 'carpetArea', 'price']
+
+
 class PropertySearchModel:
     """
     Natural Language Property Search Model for Real Estate Data
@@ -20,18 +35,99 @@ class PropertySearchModel:
             config_csv: Path to ProjectConfiguration.csv
             variant_csv: Path to ProjectConfigurationVariant.csv
         """
-        # Load CSV files with proper handling
-        self.df_project = pd.read_csv(project_csv)
-        self.df_address = pd.read_csv(address_csv)
-        self.df_config = pd.read_csv(config_csv)
-        self.df_variant = pd.read_csv(variant_csv)
-        
-        # Clean column names (remove extra spaces)
-        for df in [self.df_project, self.df_address, self.df_config, self.df_variant]:
-            df.columns = df.columns.str.strip()
-        
-        # Create merged dataset
-        self.df_merged = self._merge_dataframes()
+        # The merged frame itself is cached on disk, keyed by the source
+        # mtimes and the loaded-column set — a hit skips CSV loading *and*
+        # the three joins entirely, and editing a CSV or extending the
+        # *_COLS lists invalidates the cache
+        csv_paths = [project_csv, address_csv, config_csv, variant_csv]
+        key = hashlib.md5((
+            ''.join(str(os.path.getmtime(p)) for p in csv_paths)
+            + ','.join(PROJECT_COLS + ADDRESS_COLS + CONFIG_COLS + VARIANT_COLS)
+        ).encode()).hexdigest()[:12]
+        cache_path = f'.cache/merged_{key}.parquet'
+
+        if os.path.exists(cache_path):
+            # Predicate pushdown: rows without a price can never be
+            # returned, so skip them at the Parquet layer
+            self.df_merged = pd.read_parquet(
+                cache_path, engine='pyarrow', dtype_backend='pyarrow',
+                filters=[('price', '>', 0)])
+        else:
+            # Load CSV files (cached as Parquet after the first run)
+            self.df_project = self._load_cached(project_csv, PROJECT_COLS)
+            self.df_address = self._load_cached(address_csv, ADDRESS_COLS)
+            self.df_config = self._load_cached(config_csv, CONFIG_COLS)
+            self.df_variant = self._load_cached(variant_csv, VARIANT_COLS)
+
+            # Clean column names (remove extra spaces)
+            for df in [self.df_project, self.df_address, self.df_config, self.df_variant]:
+                df.columns = df.columns.str.strip()
+
+            # Create merged dataset; rows without a usable price (projects
+            # without variants) can never be returned, so drop them once
+            # here instead of on every query — same price > 0 predicate
+            # the cache-hit path applies, so both paths keep the same rows
+            self.df_merged = self._merge_dataframes()
+            self.df_merged = self.df_merged[
+                self.df_merged['price'] > 0].reset_index(drop=True)
+
+            try:
+                os.makedirs('.cache', exist_ok=True)
+                self.df_merged.to_parquet(cache_path, engine='pyarrow')
+            except OSError:
+                pass  # read-only working dir — just skip the cache
+
+        # Factorize the low-cardinality filter columns into lowercase
+        # categoricals: matching then compares integer category codes
+        # instead of re-scanning Python strings on every query
+        for col in ('status', 'furnishedType'):
+            if col in self.df_merged.columns:
+                self.df_merged[col] = (
+                    self.df_merged[col].astype('string')
+                    .str.lower().astype('category'))
+
+        # Force numeric dtypes so comparisons are C-level and the
+        # renderers don't need int(float(...)) per row. 'type' arrives as
+        # strings like '2BHK'/'4.5BHK' — pull out the number, but only for
+        # BHK labels so a '1RK' doesn't become a 1
+        # float32 / Int8 are plenty for these ranges and halve-to-eighth
+        # the bytes every filter and sort has to move ('type' stays float
+        # for the half-BHK labels and missing values)
+        self.df_merged['type'] = pd.to_numeric(
+            self.df_merged['type'].astype(str).str.extract(
+                r'(\d+\.?\d*)\s*bhk', flags=re.IGNORECASE)[0],
+            errors='coerce').astype('float32')
+        for col in ('bathrooms', 'balcony'):
+            self.df_merged[col] = pd.to_numeric(
+                self.df_merged[col], errors='coerce').astype('Int8')
+        for col in ('price', 'carpetArea'):
+            self.df_merged[col] = pd.to_numeric(
+                self.df_merged[col], errors='coerce').astype('float32')
+
+        # Slug is low-cardinality relative to variant rows — as a
+        # categorical, the per-query dedupe works on integer codes instead
+        # of variable-length strings
+        self.df_merged['slug'] = self.df_merged['slug'].astype('category')
+
+        # Collapse variants to the cheapest row per project/BHK/furnishing
+        # once here. Deduping all the way to one row per slug would change
+        # results (a project could only match through its surviving
+        # variant), but within the same slug/type/furnishedType the
+        # cheapest row answers every query the duplicates could
+        self.df_merged = (
+            self.df_merged.sort_values('price')
+            .drop_duplicates(subset=['slug', 'type', 'furnishedType'],
+                             keep='first')
+            .reset_index(drop=True))
+
+        # One lowercase "searchable text" column so the city filter scans
+        # a single column once per query instead of case-folding
+        # fullAddress/landmark/projectName for every keyword
+        self.df_merged['_search_blob'] = (
+            self.df_merged['fullAddress'].fillna('') + '|' +
+            self.df_merged['landmark'].fillna('') + '|' +
+            self.df_merged['projectName'].fillna('')
+        ).str.lower()
         
         # City mapping (extend as needed)
         self.city_keywords = {
@@ -43,45 +139,98 @@ class PropertySearchModel:
             'chennai': ['chennai', 'madras', 'tambaram'],
             'kolkata': ['kolkata', 'calcutta', 'salt lake']
         }
-        
+
+        # The known cities and their aliases are fixed, so each city's row
+        # mask over the merged frame is deterministic — precompute it once
+        # and the city filter becomes a dict lookup
+        self._city_masks = {}
+        blob = self.df_merged['_search_blob']
+        for city, keywords in self.city_keywords.items():
+            mask = np.zeros(len(blob), dtype=bool)
+            for keyword in keywords:
+                mask |= blob.str.contains(keyword, regex=False, na=False).to_numpy()
+            self._city_masks[city] = mask
+
+        # Pre-compiled query patterns: one alternation each for city,
+        # budget and BHK so parse_query is a few linear regex passes
+        # instead of nested Python loops over every alias. City aliases
+        # are flattened into a reverse keyword -> city dict, so the match
+        # resolves with a single lookup
+        self._kw_to_city = {keyword: city
+                            for city, keywords in self.city_keywords.items()
+                            for keyword in keywords}
+        self._kw_re = re.compile(
+            r'\b(' + '|'.join(map(re.escape, self._kw_to_city)) + r')\b')
+        # One compiled pattern per unit, searched in priority order so a
+        # crore amount anywhere in the query beats an earlier lakh amount
+        # ("from 80 lakhs up to 1.5 crore" must parse as 1.5 Cr)
+        self._budget_patterns = [
+            (re.compile(r'₹?\s*(\d+\.?\d*)\s*cr(?:ore)?s?'), 10000000),  # Crores
+            (re.compile(r'₹?\s*(\d+\.?\d*)\s*la(?:kh|c)s?'), 100000),  # Lakhs
+            (re.compile(r'₹?\s*(\d+\.?\d*)\s*l\b'), 100000),  # Lakhs (short)
+            (re.compile(r'₹?\s*(\d+\.?\d*)\s*million'), 10000000),
+        ]
+        self._bhk_re = re.compile(r'(\d+)\s*bhk')
+
         print(f"✅ Loaded {len(self.df_merged)} property records")
-        
+
+    @staticmethod
+    def _load_cached(csv_path: str,
+                     usecols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load a CSV file, caching the parsed result as a sibling Parquet file.
+
+        CSV parsing (tokenization + type inference) dominates cold start, so on
+        the first run we write a .parquet copy next to the CSV and on later runs
+        we load that instead — Parquet stores columns in their final dtypes.
+        The cache is regenerated whenever the CSV is newer than the Parquet.
+
+        Args:
+            csv_path: Path to the source CSV file
+            usecols: Columns to load; unused fields are skipped at parse time
+
+        Returns:
+            DataFrame with pyarrow-backed columns
+        """
+        pq_path = csv_path.replace('.csv', '.parquet')
+
+        if os.path.exists(pq_path) and os.path.getmtime(pq_path) >= os.path.getmtime(csv_path):
+            # The cache may predate an extension of the *_COLS lists —
+            # only use it if it still covers the requested columns
+            cached_cols = pyarrow.parquet.read_schema(pq_path).names
+            if usecols is None or set(usecols) <= set(cached_cols):
+                return pd.read_parquet(pq_path, engine='pyarrow',
+                                       columns=usecols, dtype_backend='pyarrow')
+
+        df = pd.read_csv(csv_path, usecols=usecols, dtype_backend='pyarrow')
+        try:
+            df.to_parquet(pq_path, engine='pyarrow', compression='zstd')
+        except OSError:
+            pass  # read-only data dir — just skip the cache
+        return df
+
     def _merge_dataframes(self) -> pd.DataFrame:
         """Merge all dataframes into a single searchable dataset"""
-        # Start with project
-        merged = self.df_project.copy()
-        
-        # Merge with address
-        if 'projectId' in self.df_address.columns:
-            merged = merged.merge(
-                self.df_address, 
-                left_on='id', 
-                right_on='projectId', 
-                how='left',
-                suffixes=('', '_address')
-            )
-        
-        # Merge with configuration
-        if 'projectId' in self.df_config.columns:
-            merged = merged.merge(
-                self.df_config,
-                left_on='id',
-                right_on='projectId',
-                how='left',
-                suffixes=('', '_config')
-            )
-        
-        # Merge with variant
-        config_id_col = 'id_config' if 'id_config' in merged.columns else 'id'
-        if 'configurationId' in self.df_variant.columns:
-            merged = merged.merge(
-                self.df_variant,
-                left_on=config_id_col,
-                right_on='configurationId',
-                how='left',
-                suffixes=('', '_variant')
-            )
-        
+        # Rename the foreign keys to match so each join is a plain `on=`
+        # with no duplicated key columns or invented suffixes (the tables'
+        # own surrogate ids aren't loaded at all)
+        addr = self.df_address.rename(columns={'projectId': 'id'})
+        cfg = self.df_config.rename(
+            columns={'projectId': 'id', 'id': 'config_id'})
+        var = self.df_variant.rename(columns={'configurationId': 'config_id'})
+
+        # validate= makes a bad key blow up instead of silently
+        # producing a cartesian explosion. Variants are attached to
+        # configurations first so the project join never sees the null
+        # config_id rows of projects that have no configuration yet.
+        cfg_var = cfg.merge(var, on='config_id', how='left',
+                            validate='one_to_many')
+        merged = (
+            self.df_project
+            .merge(addr, on='id', how='left', validate='one_to_many')
+            .merge(cfg_var, on='id', how='left', validate='one_to_many')
+        )
+
         return merged
     
     def parse_query(self, query: str) -> Dict:
@@ -98,57 +247,51 @@ class PropertySearchModel:
         filters = {}
         
         # Extract BHK (1BHK, 2BHK, 3BHK, etc.)
-        bhk_match = re.search(r'(\d+)\s*bhk', query_lower)
+        bhk_match = self._bhk_re.search(query_lower)
         if bhk_match:
             filters['bhk'] = int(bhk_match.group(1))
-        
-        # Extract budget in different formats
-        budget_patterns = [
-            (r'₹?\s*(\d+\.?\d*)\s*cr(?:ore)?s?', 10000000),  # Crores
-            (r'₹?\s*(\d+\.?\d*)\s*la(?:kh|c)s?', 100000),  # Lakhs
-            (r'₹?\s*(\d+\.?\d*)\s*l\b', 100000),  # Lakhs (short)
-            (r'₹?\s*(\d+\.?\d*)\s*million', 10000000),
-        ]
-        
-        for pattern, multiplier in budget_patterns:
-            match = re.search(pattern, query_lower)
+
+        # Extract budget in different formats — first matching unit wins,
+        # in crore -> lakh -> million priority
+        for pattern, multiplier in self._budget_patterns:
+            match = pattern.search(query_lower)
             if match:
                 amount = float(match.group(1).replace(',', ''))
                 filters['max_budget'] = amount * multiplier
                 break
-        
-        # Extract city
-        for city, keywords in self.city_keywords.items():
-            for keyword in keywords:
-                if keyword in query_lower:
-                    filters['city'] = city
-                    filters['city_keywords'] = keywords
-                    break
-            if 'city' in filters:
-                break
-        
+
+        # Extract city — match any alias, then resolve it via the reverse dict
+        city_match = self._kw_re.search(query_lower)
+        if city_match:
+            city = self._kw_to_city[city_match.group(1)]
+            filters['city'] = city
+            filters['city_keywords'] = self.city_keywords[city]
+        
+        # Tokenize once; the status / property-type / furnished checks all
+        # become set lookups instead of repeated substring scans
+        tokens = set(re.findall(r'[a-z]+', query_lower))
+
         # Extract readiness/possession status
-        if any(word in query_lower for word in ['ready', 'immediate', 'ready to move']):
+        if tokens & {'ready', 'immediate'}:
             filters['status'] = 'ready'
-        elif any(word in query_lower for word in ['under construction', 'upcoming']):
+        elif 'upcoming' in tokens or {'under', 'construction'} <= tokens:
             filters['status'] = 'under_construction'
-        
+
         # Extract property type
-        if 'apartment' in query_lower or 'flat' in query_lower:
+        if tokens & {'apartment', 'apartments', 'flat', 'flats'}:
             filters['property_type'] = 'apartment'
-        elif 'villa' in query_lower:
+        elif tokens & {'villa', 'villas'}:
             filters['property_type'] = 'villa'
-        elif 'plot' in query_lower:
+        elif tokens & {'plot', 'plots'}:
             filters['property_type'] = 'plot'
-        
-        # Extract furnished type
-        if 'furnished' in query_lower:
-            if 'semi' in query_lower or 'semi-furnished' in query_lower:
-                filters['furnished'] = 'SEMI-FURNISHED'
-            elif 'unfurnished' in query_lower:
-                filters['furnished'] = 'UNFURNISHED'
-            else:
-                filters['furnished'] = 'FURNISHED'
+
+        # Extract furnished type ('semi-furnished' tokenizes to semi + furnished)
+        if 'unfurnished' in tokens:
+            filters['furnished'] = 'UNFURNISHED'
+        elif 'semi' in tokens and 'furnished' in tokens:
+            filters['furnished'] = 'SEMI_FURNISHED'
+        elif 'furnished' in tokens:
+            filters['furnished'] = 'FURNISHED'
         
         return filters
     
@@ -164,53 +307,44 @@ class PropertySearchModel:
             Tuple of (filtered DataFrame, extracted filters)
         """
         filters = self.parse_query(query)
-        df_filtered = self.df_merged.copy()
-        
-        # Remove rows with missing critical data
-        df_filtered = df_filtered.dropna(subset=['price'])
-        
-        
-        # Apply BHK filter
+        # No copy: every filter below rebinds df_filtered to a new frame,
+        # so the merged frame is never mutated
+        df_filtered = self.df_merged
+
+
+        # Apply BHK filter — accumulate into a raw numpy mask instead of a
+        # False-filled Series, skipping index alignment on every |=
         if 'bhk' in filters:
             bhk_value = filters['bhk']
-            df_filtered = df_filtered.reset_index(drop=True)  # <--- ADD THIS
-            bhk_filter = pd.Series([False] * len(df_filtered))
-            
+            mask = np.zeros(len(df_filtered), dtype=bool)
+
             if 'type' in df_filtered.columns:
-                bhk_filter |= (df_filtered['type'] == bhk_value)
-            
+                mask |= (df_filtered['type'].to_numpy() == bhk_value)
+
             if 'customBHK' in df_filtered.columns:
-                bhk_filter |= (df_filtered['customBHK'].astype(str).str.contains(
-                    f"{bhk_value}BHK", case=False, na=False))
-                bhk_filter |= (df_filtered['customBHK'].astype(str).str.contains(
-                    f"{bhk_value} BHK", case=False, na=False))
-            
-            df_filtered = df_filtered[bhk_filter]
+                custom_bhk = df_filtered['customBHK'].astype(str).str.lower()
+                mask |= custom_bhk.str.contains(
+                    f"{bhk_value}bhk", regex=False, na=False).to_numpy()
+                mask |= custom_bhk.str.contains(
+                    f"{bhk_value} bhk", regex=False, na=False).to_numpy()
+
+            df_filtered = df_filtered[mask]
+            if df_filtered.empty:
+                return df_filtered, filters
 
         # Apply budget filter
         if 'max_budget' in filters:
             df_filtered = df_filtered[df_filtered['price'] <= filters['max_budget']]
-        
-        # Apply city filter - search in fullAddress, landmark, and projectName
+            if df_filtered.empty:
+                return df_filtered, filters
+
+        # Apply city filter — a lookup into the bitmap precomputed at init;
+        # the merged frame has a RangeIndex so row labels are positions
         if 'city' in filters:
-            df_filtered = df_filtered.reset_index(drop=True)  # 👈 FIX added here
-            city_keywords = filters.get('city_keywords', [filters['city']])
-            city_filter = pd.Series([False] * len(df_filtered))
-            
-            for keyword in city_keywords:
-                if 'fullAddress' in df_filtered.columns:
-                    city_filter |= df_filtered['fullAddress'].astype(str).str.contains(
-                        keyword, case=False, na=False)
-                
-                if 'landmark' in df_filtered.columns:
-                    city_filter |= df_filtered['landmark'].astype(str).str.contains(
-                        keyword, case=False, na=False)
-                
-                if 'projectName' in df_filtered.columns:
-                    city_filter |= df_filtered['projectName'].astype(str).str.contains(
-                        keyword, case=False, na=False)
-            
-            df_filtered = df_filtered[city_filter]
+            city_mask = self._city_masks[filters['city']]
+            df_filtered = df_filtered[city_mask[df_filtered.index.to_numpy()]]
+            if df_filtered.empty:
+                return df_filtered, filters
 
         
         # Apply status filter
@@ -221,34 +355,50 @@ class PropertySearchModel:
             else:
                 status_keywords = ['under construction', 'ongoing', 'upcoming']
             
-            status_filter = pd.Series([False] * len(df_filtered))
-            for keyword in status_keywords:
-                status_filter |= df_filtered['status'].astype(str).str.contains(
-                    keyword, case=False, na=False)
-            
-            df_filtered = df_filtered[status_filter]
+            # Match keywords against the (few) categories once, then
+            # filter with an integer-code isin instead of row-wise scans;
+            # categories use underscores ('under_construction'), keywords
+            # use spaces, so normalize before comparing
+            matching = [c for c in df_filtered['status'].cat.categories
+                        if any(k in c.replace('_', ' ')
+                               for k in status_keywords)]
+            df_filtered = df_filtered[df_filtered['status'].isin(matching)]
+            if df_filtered.empty:
+                return df_filtered, filters
         
         # Apply furnished filter
         if 'furnished' in filters and 'furnishedType' in df_filtered.columns:
             df_filtered = df_filtered[
-                df_filtered['furnishedType'].astype(str).str.upper() == filters['furnished']
+                df_filtered['furnishedType'] == filters['furnished'].lower()
             ]
+            if df_filtered.empty:
+                return df_filtered, filters
         
         # Sort by price (ascending)
         # df_filtered = df_filtered.sort_values('price', ascending=True)
         # Sort by relevance: ready > under construction, then price
-        if 'status' in df_filtered.columns:
-            df_filtered['status_score'] = df_filtered['status'].astype(str).str.contains('ready', case=False, na=False).astype(int)
-            df_filtered = df_filtered.sort_values(by=['status_score', 'price'], ascending=[False, True])
-            df_filtered = df_filtered.drop(columns=['status_score'])
+        # (nothing to order with a single row)
+        if len(df_filtered) <= 1:
+            pass
+        elif 'status' in df_filtered.columns:
+            ready = df_filtered['status'].astype(str).str.contains(
+                'ready', regex=False, na=False).to_numpy()
+            price = df_filtered['price'].to_numpy()
+            # lexsort keys: primary key (ready-first) goes last
+            order = np.lexsort((price, ~ready))
+            df_filtered = df_filtered.iloc[order]
         else:
             df_filtered = df_filtered.sort_values('price', ascending=True)
-        # Remove duplicates and limit results
-        if 'projectName' in df_filtered.columns:
-            # df_filtered = df_filtered.drop_duplicates(
-            #     subset=['projectName', 'type', 'price'], keep='first')
-             df_filtered = df_filtered.drop_duplicates(
-                 subset=['slug'], keep='first')  # 👈 Slug is unique per project   
+        # Keep the first (best-ranked) row per project and limit results —
+        # np.unique on the slug category codes finds first occurrences
+        # without re-hashing strings per query
+        if 'slug' in df_filtered.columns and len(df_filtered) > 1:
+            codes = df_filtered['slug'].cat.codes.to_numpy()
+            first_idx = np.unique(codes, return_index=True)[1]
+            if len(first_idx) != len(codes):
+                keep = np.zeros(len(codes), dtype=bool)
+                keep[first_idx] = True
+                df_filtered = df_filtered[keep]
         df_filtered = df_filtered.head(limit)
         
         return df_filtered, filters
@@ -415,9 +565,9 @@ class PropertySearchModel:
             status = row.get('status', 'Available')
             carpet_area = row.get('carpetArea', 'N/A')
             
-            # Format carpet area
+            # Format carpet area (%g keeps float32 values readable)
             if pd.notna(carpet_area) and carpet_area != 'N/A':
-                carpet_area_str = f"{carpet_area} sq.ft"
+                carpet_area_str = f"{carpet_area:g} sq.ft"
             else:
                 carpet_area_str = "N/A"
             
@@ -431,18 +581,12 @@ class PropertySearchModel:
             if 'lift' in row and str(row['lift']).upper() == 'TRUE':
                 amenities.append('Lift')
             if 'balcony' in row and pd.notna(row['balcony']):
-                try:
-                    bal_count = int(float(row['balcony']))
-                    if bal_count > 0:
-                        amenities.append(f'{bal_count} Balcony' if bal_count == 1 else f'{bal_count} Balconies')
-                except:
-                    pass
+                bal_count = int(row['balcony'])
+                if bal_count > 0:
+                    amenities.append(f'{bal_count} Balcony' if bal_count == 1 else f'{bal_count} Balconies')
             if 'bathrooms' in row and pd.notna(row['bathrooms']):
-                try:
-                    bath_count = int(float(row['bathrooms']))
-                    amenities.append(f'{bath_count} Bathroom' if bath_count == 1 else f'{bath_count} Bathrooms')
-                except:
-                    pass
+                bath_count = int(row['bathrooms'])
+                amenities.append(f'{bath_count} Bathroom' if bath_count == 1 else f'{bath_count} Bathrooms')
             
             # Add generic amenities if none found
             if not amenities: